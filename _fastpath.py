@@ -0,0 +1,70 @@
+"""Hot per-request helpers for main.py.
+
+Everything here is pure Python with full type annotations and no FastAPI or
+sqlite imports, so the module can be compiled ahead of time with mypyc
+(`python -m mypyc _fastpath.py`); the compiled extension shadows this file
+and this source remains the uncompiled fallback. Keep it that way: no
+framework types, no module-level app state.
+"""
+
+import base64
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+
+# Pre-joined "?,?,..." strings for IN clauses; filter lists are tiny.
+_QMARKS: Tuple[str, ...] = tuple(",".join("?" * n) for n in range(33))
+
+
+def qmarks(n: int) -> str:
+    return _QMARKS[n] if n < len(_QMARKS) else ",".join("?" * n)
+
+
+# Clause texts only depend on the column name and the number of selected
+# values, so the handful of distinct fragments is memoized; repeated requests
+# reuse interned strings instead of re-joining them.
+@lru_cache(maxsize=256)
+def in_clause(col: str, n: int) -> str:
+    return f"{col} IN ({qmarks(n)})"
+
+
+@lru_cache(maxsize=256)
+def coalesce_or(cols: Tuple[str, ...]) -> str:
+    return "(" + " OR ".join(f"COALESCE({c}, 0) > 0" for c in cols) + ")"
+
+
+def dominant_from_vals(vals: Tuple[Any, ...], labels: Tuple[str, ...]) -> Optional[str]:
+    # Dominant content area label by max value among s1..s6 (first on ties,
+    # like the old loop). Values come back from SQLite as REAL or None, so no
+    # defensive float() is needed in this per-row hot path.
+    vals = tuple(v or 0 for v in vals)
+    idx = max(range(6), key=vals.__getitem__)
+    return labels[idx] if vals[idx] > 0 else None
+
+
+def make_list_item(vals: Tuple[Any, ...], keys: Tuple[str, ...],
+                   labels: Tuple[str, ...]) -> Dict[str, Any]:
+    # One call per list row: the first nine columns become the item dict and
+    # s1..s6 (columns 9..14) collapse into dominant_content_area.
+    item = dict(zip(keys, vals))
+    item["dominant_content_area"] = dominant_from_vals(vals[9:15], labels)
+    return item
+
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps([sort_value, row_id])).decode()
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[Any, int]]:
+    # Returns None on any malformed input; the caller maps that to a 400.
+    try:
+        sort_value, row_id = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+        row_id = int(row_id)
+    except (ValueError, TypeError):
+        return None
+    # JSON can smuggle in containers, which sqlite3 would reject at bind time
+    # with an unhandled error; only scalar sort values are legitimate.
+    if not (sort_value is None or isinstance(sort_value, (str, int, float))):
+        return None
+    return sort_value, row_id
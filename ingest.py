@@ -0,0 +1,265 @@
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+from typing import Any, Dict, List, Tuple
+
+from openpyxl import load_workbook
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(APP_DIR, "data", "items.db")
+EXCEL_PATH = os.path.join(APP_DIR, "Item bank from DigiArvi 2025 - Final.xlsx")
+
+# The workbook has two banner rows above the real header row.
+HEADER_ROWS = 2
+
+# Column groups, in sheet order, that split the wide sheet into the tables
+# main.py joins on. Every table additionally gets the `no` column as `id`.
+TABLE_COLUMNS = {
+    "items": [
+        "label", "name", "name_2", "max", "n", "source",
+    ],
+    "items_content_area": [
+        "s1_thinking_skills_including_computational_thinking",
+        "s2_numbers_and_operations",
+        "s3_algebra",
+        "s4_functions",
+        "s5_geometry_and_measurement",
+        "s6_data_handling_statistics_and_probability",
+    ],
+    "items_target_area": [
+        "t10_performs_mental_calculations_and_makes_inferences_related_to_s1_and_s2",
+        "t11_performs_basic_calculations_with_rational_numbers_related_to_s2",
+        "t12_understands_the_concept_of_a_real_number_related_to_s2",
+        "t13_calculates_proportions_numbers_referring_to_percentages_and_percentages_related_to_change_and_comparison_related_to_s2",
+        "t14_solves_equations_related_to_s3_and_s4",
+        "t15_interprets_and_forms_functions_related_to_s3_and_s4",
+        "t16_understands_relations_between_geometric_concepts_related_to_s5",
+        "t17_utilizes_properties_related_to_right_triangles_and_circles_related_to_s5",
+        "t18_calculates_areas_and_volumes_related_to_s5",
+        "t19_determines_statistical_measures_and_calculates_probabilities_related_to_s6",
+        "t20_applies_algorithmic_thinking_and_problem_solving_including_through_programming_related_to_s1",
+    ],
+    "items_NuTa_content_area": [
+        "nuta_skill_level", "contents",
+        "c1_numeric_system", "c2_basic_numerical_operations", "c3_geometry",
+        "c4_time_and_measures", "c5_fractions", "c6_decimal_numbers",
+        "c7_percentages", "c8_circumference_area_and_volume",
+        "c9_statistics_and_probability",
+    ],
+    "items_type": [
+        "item_type_all", "mcq", "multiple_mcq", "short_answer", "combine", "order",
+    ],
+    "items_hierarchical_level": [
+        "hierarchical_level_all", "h1_recall", "h2_comprehensiuon",
+        "h3_application", "h4_higher_skills",
+    ],
+    "items_difficulty_level": [
+        "meanp_all_classical", "p_g3_classical", "p_g6_classical",
+        "p_g8_classical", "p_g9_classical",
+        "b_0_1_irt", "b01_2_irt", "b012_3_irt", "b0123_4_irt",
+        "se_b_0_1_irt", "se_b01_2_irt", "se_b012_3_irt", "se_b0123_4_irt",
+    ],
+    "items_discrimination": [
+        "meanrit_classical", "meang_classical", "meand_classical",
+        "meanstd_classical", "a_irt",
+    ],
+}
+
+# Bulk-load PRAGMAs: durability is irrelevant while rebuilding from the source
+# workbook, so trade it for insert throughput.
+BULK_PRAGMAS = [
+    "PRAGMA synchronous=OFF",
+    "PRAGMA journal_mode=MEMORY",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-200000",
+]
+
+
+# --- Header helpers ---
+
+_RE_NONALNUM = re.compile(r"[^0-9a-zA-Z]+")
+_RE_UNDERS = re.compile(r"_+")
+_RE_IDENT = re.compile(r"[A-Za-z_][A-Za-z0-9_]*\Z")
+
+
+def _check_identifier(name: str) -> str:
+    # Table and column names are interpolated into DDL/INSERT statements
+    # (placeholders cannot bind identifiers), so refuse anything that is not a
+    # plain identifier.
+    if not _RE_IDENT.match(name):
+        raise ValueError(f"Unsafe SQL identifier: {name!r}")
+    return name
+
+
+def _normalize_column(name: Any) -> str:
+    n = _RE_NONALNUM.sub("_", str(name).strip().lower())
+    n = _RE_UNDERS.sub("_", n).strip("_")
+    return n or "col"
+
+
+def _dedupe_columns(cols: List[str]) -> List[str]:
+    # Single pass with a suffix counter per base name; O(n) over the header.
+    counts: Dict[str, int] = {}
+    out: List[str] = []
+    for c in cols:
+        n = counts.get(c, 0)
+        if n == 0:
+            out.append(c)
+            counts[c] = 1
+        else:
+            while f"{c}_{n}" in counts:
+                n += 1
+            name = f"{c}_{n}"
+            out.append(name)
+            counts[c] = n + 1
+            counts[name] = 1
+    return out
+
+
+def _infer_types(header: List[str], rows: List[Tuple]) -> Dict[str, str]:
+    # Column affinity from the values openpyxl yields: int/float/str/None.
+    types: Dict[str, str] = {}
+    for col_idx, col in enumerate(header):
+        sql_type = "TEXT"
+        seen_value = False
+        all_int = True
+        all_num = True
+        for row in rows:
+            v = row[col_idx]
+            if v is None:
+                continue
+            seen_value = True
+            if not isinstance(v, (int, float)) or isinstance(v, bool):
+                all_num = False
+                break
+            if not isinstance(v, int):
+                all_int = False
+        if seen_value and all_num:
+            sql_type = "INTEGER" if all_int else "REAL"
+        types[col] = sql_type
+    return types
+
+
+def _read_sheet(excel_path: str, sheet_index: int) -> Tuple[List[str], List[Tuple]]:
+    # read_only streams the sheet instead of building the whole workbook in
+    # memory (openpyxl otherwise needs roughly 50x the file size in RAM).
+    wb = load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[sheet_index]
+        it = ws.iter_rows(values_only=True)
+        for _ in range(HEADER_ROWS):
+            next(it)
+        raw_header = next(it)
+        header = _dedupe_columns([_normalize_column(c) for c in raw_header])
+        ncols = len(header)
+        # read_only mode can yield short rows when trailing cells are empty.
+        rows = [row + (None,) * (ncols - len(row)) if len(row) < ncols else row
+                for row in it]
+    finally:
+        wb.close()
+    return header, rows
+
+
+def _source_fingerprint(excel_path: str) -> Tuple[str, float]:
+    with open(excel_path, "rb") as f:
+        digest = hashlib.file_digest(f, "sha1").hexdigest()
+    return digest, os.path.getmtime(excel_path)
+
+
+def _is_current(conn: sqlite3.Connection, sheet_index: int,
+                src_hash: str, mtime: float) -> bool:
+    try:
+        row = conn.execute(
+            "SELECT src_hash, mtime FROM _ingest_meta WHERE sheet_index = ?",
+            (sheet_index,),
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return False
+    if row is None or row[0] != src_hash or row[1] != mtime:
+        return False
+    tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    return all(t in tables for t in TABLE_COLUMNS)
+
+
+# --- Loader ---
+
+def load_excel_to_sqlite(db_path: str = DB_PATH, excel_path: str = EXCEL_PATH,
+                         sheet_index: int = 0, force: bool = False) -> Dict[str, Any]:
+    src_hash, mtime = _source_fingerprint(excel_path)
+
+    # Re-parsing and re-inserting an unchanged workbook is pure waste; compare
+    # against the fingerprint recorded by the previous run and skip if current.
+    if not force and os.path.exists(db_path):
+        conn = sqlite3.connect(db_path)
+        try:
+            if _is_current(conn, sheet_index, src_hash, mtime):
+                rows_loaded = conn.execute(
+                    "SELECT rows FROM _ingest_meta WHERE sheet_index = ?",
+                    (sheet_index,),
+                ).fetchone()[0]
+                return {"rows": rows_loaded, "tables": list(TABLE_COLUMNS), "skipped": True}
+        finally:
+            conn.close()
+
+    header, rows = _read_sheet(excel_path, sheet_index)
+    header[0] = "id"  # the sheet's running `no` column is the join key
+    col_types = _infer_types(header, rows)
+    col_index = {c: i for i, c in enumerate(header)}
+
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    try:
+        cur = conn.cursor()
+        for pragma in BULK_PRAGMAS:
+            cur.execute(pragma)
+        # One transaction for the whole rebuild: a single fsync instead of one per row.
+        cur.execute("BEGIN")
+        for table, cols in TABLE_COLUMNS.items():
+            _check_identifier(table)
+            indices = [0] + [col_index[c] for c in cols]
+            table_cols = [_check_identifier(c) for c in ["id"] + cols]
+            cur.execute(f'DROP TABLE IF EXISTS "{table}"')
+            # id as INTEGER PRIMARY KEY aliases the rowid, so point lookups and
+            # id-ordered scans use the table's own B-tree without a second index.
+            col_defs = ", ".join(
+                '"id" INTEGER PRIMARY KEY' if c == "id" else f'"{c}" {col_types[c]}'
+                for c in table_cols
+            )
+            cur.execute(f'CREATE TABLE "{table}" ({col_defs})')
+            placeholders = ",".join("?" * len(table_cols))
+            # executemany accepts any iterable; a generator keeps one projected
+            # row alive at a time instead of a second full list per table.
+            cur.executemany(
+                f'INSERT INTO "{table}" VALUES ({placeholders})',
+                (tuple(row[i] for i in indices) for row in rows),
+            )
+        cur.execute(
+            "CREATE TABLE IF NOT EXISTS _ingest_meta "
+            "(sheet_index INTEGER PRIMARY KEY, src_hash TEXT, mtime REAL, rows INTEGER)"
+        )
+        cur.execute(
+            "INSERT OR REPLACE INTO _ingest_meta VALUES (?, ?, ?, ?)",
+            (sheet_index, src_hash, mtime, len(rows)),
+        )
+        cur.execute("COMMIT")
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    return {"rows": len(rows), "tables": list(TABLE_COLUMNS), "skipped": False}
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if a != "--force"]
+    force = "--force" in sys.argv[1:]
+    excel = args[0] if len(args) > 0 else EXCEL_PATH
+    db = args[1] if len(args) > 1 else DB_PATH
+    summary = load_excel_to_sqlite(db, excel, force=force)
+    if summary["skipped"]:
+        print(f"{db} is already current for {excel} (use --force to rebuild)")
+    else:
+        print(f"Loaded {summary['rows']} rows into {len(summary['tables'])} tables at {db}")
@@ -1,11 +1,33 @@
+import asyncio
+import hashlib
 import os
+import re
 import sqlite3
-from typing import List, Optional, Tuple, Dict, Any
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import AsyncIterator, List, Optional, Set, Tuple, Dict, Any
 
-from fastapi import FastAPI, Query, HTTPException, Response
-from fastapi.responses import JSONResponse, FileResponse
+import aiosqlite
+
+import orjson
+
+from fastapi import FastAPI, Query, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, FileResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+
+# Per-row/per-request helpers live in _fastpath so they can be mypyc-compiled;
+# aliased to the underscore names the rest of this module always used.
+from _fastpath import (
+    in_clause as _in_clause,
+    coalesce_or as _coalesce_or,
+    dominant_from_vals as _dominant_from_vals,
+    make_list_item as _make_list_item,
+    encode_cursor as _encode_cursor,
+    decode_cursor as _decode_cursor,
+)
 
 APP_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(APP_DIR, "data", "items.db")
@@ -14,7 +36,9 @@ STATIC_DIR = os.path.join(APP_DIR, "static")
 # Ensure the data directory exists in deployment environments (e.g., Railway)
 os.makedirs(os.path.join(APP_DIR, "data"), exist_ok=True)
 
-app = FastAPI(title="Item Bank API", version="1.0")
+# orjson serializes the large list payloads several times faster than the
+# stdlib encoder.
+app = FastAPI(title="Item Bank API", version="1.0", default_response_class=ORJSONResponse)
 
 # If you decide to serve the frontend separately, CORS will help. For now, same origin, but this is harmless.
 app.add_middleware(
@@ -25,24 +49,303 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# The list payloads compress 5-10x (repeated field names, label strings);
+# level 5 keeps CPU cost modest, and tiny responses skip compression entirely.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # --- DB helpers ---
 
-def get_conn() -> sqlite3.Connection:
+def _ensure_db() -> None:
     if not os.path.exists(DB_PATH):
         # Create an empty DB file so the app can boot; real data should be provided via items.db.
         os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
         conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
         try:
             # Minimal placeholder table to make health checks pass; real queries expect full schema.
             conn.execute("CREATE TABLE IF NOT EXISTS items (id INTEGER PRIMARY KEY, name TEXT)")
+            conn.commit()
         except Exception:
             pass
-        return conn
-    conn = sqlite3.connect(DB_PATH)
+        finally:
+            conn.close()
+
+
+# Run the bootstrap once at import instead of re-checking on every request.
+_ensure_db()
+
+
+# Applied once per connection: the cache/mmap settings keep hot pages out of
+# the syscall path, and this API never relies on FK enforcement.
+CONNECTION_PRAGMAS = [
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA foreign_keys=OFF",
+]
+
+
+# Bounded pool of long-lived connections: opening sqlite3 per request throws
+# away the page cache and pays connect + PRAGMA setup on every call. The pool
+# holds aiosqlite connections so handlers await queries instead of tying up a
+# threadpool worker per request.
+POOL_SIZE = min(os.cpu_count() or 4, 8)
+_pool: "asyncio.Queue[aiosqlite.Connection]" = asyncio.Queue(maxsize=POOL_SIZE)
+
+
+def _immutable_ok() -> bool:
+    # immutable=1 tells SQLite the file cannot change while open, which skips
+    # all locking and change-detection on every read. That promise holds here
+    # because the only writer is startup maintenance, which finishes (and
+    # checkpoints the WAL away) before the pool opens. A leftover -wal sidecar
+    # means some other writer is active, so fall back to a normal connection.
+    return not os.path.exists(DB_PATH + "-wal")
+
+
+async def _open_conn() -> aiosqlite.Connection:
+    # cached_statements above the default 128: the list SQL varies by filter
+    # combination and we want each variant's prepared form to stay resident.
+    if _immutable_ok():
+        conn = await aiosqlite.connect(f"file:{DB_PATH}?mode=ro&immutable=1",
+                                       uri=True, isolation_level=None,
+                                       cached_statements=256)
+    else:
+        conn = await aiosqlite.connect(DB_PATH, isolation_level=None,
+                                       cached_statements=256)
+        # WAL is persistent and requires write access to switch; readers of a
+        # read-only deployment keep whatever journal mode the file shipped with.
+        if os.access(DB_PATH, os.W_OK):
+            try:
+                await conn.execute("PRAGMA journal_mode=WAL")
+            except sqlite3.Error:
+                pass
     conn.row_factory = sqlite3.Row
+    for pragma in CONNECTION_PRAGMAS:
+        try:
+            await conn.execute(pragma)
+        except sqlite3.Error:
+            pass
     return conn
 
+
+async def _init_pool() -> None:
+    while True:
+        try:
+            await _close_conn(_pool.get_nowait())
+        except asyncio.QueueEmpty:
+            break
+    for _ in range(POOL_SIZE):
+        _pool.put_nowait(await _open_conn())
+
+
+# Tables joined by id in BASE_SELECT. Ingest-built databases alias id to the
+# rowid; older ones need an explicit index for the planner to seek on it.
+JOIN_TABLES = [
+    "items", "items_type", "items_hierarchical_level", "items_difficulty_level",
+    "items_discrimination", "items_content_area", "items_NuTa_content_area",
+    "items_target_area",
+]
+
+# Columns the API filters with equality/IN; without these every filtered list
+# request scans the joined tables. The (sort column, id) composites cover the
+# ORDER BY ... , id orders SAFE_SORT_COLUMNS produces.
+STARTUP_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_items_source ON items(source)",
+    "CREATE INDEX IF NOT EXISTS ix_items_type_item_type_all ON items_type(item_type_all)",
+    "CREATE INDEX IF NOT EXISTS ix_items_hierarchical_level_all ON items_hierarchical_level(hierarchical_level_all)",
+    'CREATE INDEX IF NOT EXISTS "ix_items_NuTa_skill_level" ON "items_NuTa_content_area"(nuta_skill_level)',
+    "CREATE INDEX IF NOT EXISTS ix_items_label_id ON items(label, id)",
+    "CREATE INDEX IF NOT EXISTS ix_items_name_id ON items(name, id)",
+    "CREATE INDEX IF NOT EXISTS ix_items_name_2_id ON items(name_2, id)",
+    "CREATE INDEX IF NOT EXISTS ix_items_source_id ON items(source, id)",
+    "CREATE INDEX IF NOT EXISTS ix_items_n_id ON items(n, id)",
+    "CREATE INDEX IF NOT EXISTS ix_items_type_all_id ON items_type(item_type_all, id)",
+    "CREATE INDEX IF NOT EXISTS ix_ih_level_all_id ON items_hierarchical_level(hierarchical_level_all, id)",
+    "CREATE INDEX IF NOT EXISTS ix_idl_meanp_id ON items_difficulty_level(meanp_all_classical, id)",
+    "CREATE INDEX IF NOT EXISTS ix_ids_a_irt_id ON items_discrimination(a_irt, id)",
+    "CREATE INDEX IF NOT EXISTS ix_ids_meanrit_id ON items_discrimination(meanrit_classical, id)",
+]
+
+
+# Search runs against an FTS5 index when the build supports it; build_where_clauses
+# falls back to the old LIKE scan otherwise. Set by _startup().
+_fts_available = False
+
+# True once items carries the precomputed ca_mask/ta_mask columns, letting the
+# area filters test one integer instead of OR-ing COALESCEs over a join.
+# Set by _startup().
+_mask_filters_available = False
+
+
+def _rebuild_masks(cur: sqlite3.Cursor) -> None:
+    # One-shot denormalization: ca_mask bit i is set when the i-th s-column is
+    # positive, likewise ta_mask for t10..t20 (bit order per *_BITS). Rebuilt
+    # every boot so the masks track whatever ingest.py last loaded.
+    for col in ("ca_mask", "ta_mask"):
+        try:
+            cur.execute(f"ALTER TABLE items ADD COLUMN {col} INTEGER")
+        except sqlite3.OperationalError:
+            pass  # column already exists
+    ca_expr = " | ".join(
+        f"((COALESCE({CONTENT_AREA_MAP[key]}, 0) > 0) << {i})"
+        for i, key in enumerate(CONTENT_AREA_MAP)
+    )
+    ta_expr = " | ".join(
+        f"((COALESCE({TARGET_AREA_MAP[key]}, 0) > 0) << {i})"
+        for i, key in enumerate(TARGET_AREA_MAP)
+    )
+    cur.execute(
+        "UPDATE items SET "
+        f"ca_mask = COALESCE((SELECT {ca_expr} FROM items_content_area ic "
+        "WHERE ic.id = items.id), 0), "
+        f"ta_mask = COALESCE((SELECT {ta_expr} FROM items_target_area ta "
+        "WHERE ta.id = items.id), 0)"
+    )
+
+
+def _probe_masks() -> bool:
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        try:
+            cols = {r[1] for r in conn.execute("PRAGMA table_info(items)")}
+            return "ca_mask" in cols and "ta_mask" in cols
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return False
+
+
+def _rebuild_fts(cur: sqlite3.Cursor) -> None:
+    # Contentless-style mirror of the searchable text, keyed by items.id via
+    # rowid. The dataset is small and only changes offline, so a full rebuild
+    # at boot is cheaper than keeping triggers around.
+    cur.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5("
+        "label, name, source, nuta_contents, "
+        "tokenize=\"unicode61 remove_diacritics 2\")"
+    )
+    cur.execute("DELETE FROM items_fts")
+    cur.execute(
+        "INSERT INTO items_fts(rowid, label, name, source, nuta_contents) "
+        "SELECT i.id, i.label, i.name, i.source, nt.contents "
+        "FROM items i "
+        'LEFT JOIN "items_NuTa_content_area" nt ON nt.id = i.id'
+    )
+
+
+def _probe_fts() -> bool:
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        try:
+            row = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='items_fts'"
+            ).fetchone()
+            return row is not None
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return False
+
+
+def _run_startup_maintenance() -> None:
+    # One writable connection at boot: make sure the join keys and filter
+    # columns are indexed, rebuild the search index, then refresh planner
+    # statistics.
+    if not os.access(DB_PATH, os.W_OK):
+        return
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        cur = conn.cursor()
+        for table in JOIN_TABLES:
+            try:
+                has_pk = any(r[5] for r in cur.execute(f'PRAGMA table_info("{table}")'))
+                if not has_pk:
+                    cur.execute(f'CREATE INDEX IF NOT EXISTS "ix_{table}_id" ON "{table}"(id)')
+            except sqlite3.Error:
+                pass
+        for sql in STARTUP_INDEXES:
+            try:
+                cur.execute(sql)
+            except sqlite3.Error:
+                pass
+        try:
+            _rebuild_fts(cur)
+        except sqlite3.Error:
+            # SQLite built without FTS5; search falls back to LIKE.
+            pass
+        try:
+            _rebuild_masks(cur)
+        except sqlite3.Error:
+            pass
+        try:
+            cur.execute("ANALYZE")
+        except sqlite3.Error:
+            pass
+        conn.commit()
+        # Fold any WAL back into the main file so closing this connection
+        # leaves no -wal sidecar and the pool can open immutable readers.
+        try:
+            cur.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.Error:
+            pass
+    finally:
+        conn.close()
+
+
+async def _close_conn(conn: aiosqlite.Connection) -> None:
+    # SQLite's recommended lightweight companion to ANALYZE: refresh whatever
+    # stats the optimizer found lacking before the connection goes away.
+    try:
+        await conn.execute("PRAGMA optimize")
+    except (sqlite3.Error, ValueError):
+        pass
+    try:
+        await conn.close()
+    except (sqlite3.Error, ValueError):
+        pass
+
+
+@asynccontextmanager
+async def get_conn() -> AsyncIterator[aiosqlite.Connection]:
+    try:
+        conn = _pool.get_nowait()
+    except asyncio.QueueEmpty:
+        # Pool exhausted (or not yet initialized): fall back to a throwaway
+        # connection rather than blocking the request.
+        conn = await _open_conn()
+    try:
+        await conn.execute("SELECT 1")
+    except (sqlite3.Error, ValueError):
+        await _close_conn(conn)
+        conn = await _open_conn()
+    try:
+        yield conn
+    finally:
+        try:
+            _pool.put_nowait(conn)
+        except asyncio.QueueFull:
+            await _close_conn(conn)
+
+
+@app.on_event("startup")
+async def _startup() -> None:
+    # Index/ANALYZE maintenance runs once over a plain sync connection before
+    # the app starts serving; the request path is async-only.
+    global _fts_available, _mask_filters_available
+    _run_startup_maintenance()
+    _fts_available = _probe_fts()
+    _mask_filters_available = _probe_masks()
+    await _init_pool()
+
+
+@app.on_event("shutdown")
+async def _shutdown() -> None:
+    while True:
+        try:
+            await _close_conn(_pool.get_nowait())
+        except asyncio.QueueEmpty:
+            break
+
 CONTENT_AREAS = [
     ("s1_thinking_skills_including_computational_thinking", "S1 Thinking Skills (incl. Computational Thinking)"),
     ("s2_numbers_and_operations", "S2 Numbers & Operations"),
@@ -78,25 +381,120 @@ TARGET_AREAS = [
     ("t20", "T20 Algorithmic Thinking & Programming (S1)"),
 ]
 
+# Fields a client may project in the /api/items list payload, in output order.
+LIST_ITEM_FIELDS = (
+    "id", "label", "name", "source", "item_type_all", "hierarchical_level_all",
+    "meanp_all_classical", "meanrit_classical", "a_irt", "dominant_content_area",
+)
+LIST_ITEM_FIELD_SET = frozenset(LIST_ITEM_FIELDS)
+
+# Keys for the leading columns of LIST_SELECT, in SELECT order; rows are
+# unpacked positionally so no per-field hashed Row lookups happen in the loop.
+LIST_ROW_KEYS = LIST_ITEM_FIELDS[:9]
+
+# Map short keys to actual SQL columns to avoid relying on SELECT aliases in WHERE
+CONTENT_AREA_MAP = {
+    "s1": "ic.s1_thinking_skills_including_computational_thinking",
+    "s2": "ic.s2_numbers_and_operations",
+    "s3": "ic.s3_algebra",
+    "s4": "ic.s4_functions",
+    "s5": "ic.\"s5_geometry_and_measurement\"",
+    "s6": "ic.s6_data_handling_statistics_and_probability",
+}
+
+TARGET_AREA_MAP = {
+    "t10": "ta.t10_performs_mental_calculations_and_makes_inferences_related_to_s1_and_s2",
+    "t11": "ta.t11_performs_basic_calculations_with_rational_numbers_related_to_s2",
+    "t12": "ta.t12_understands_the_concept_of_a_real_number_related_to_s2",
+    "t13": "ta.t13_calculates_proportions_numbers_referring_to_percentages_and_percentages_related_to_change_and_comparison_related_to_s2",
+    "t14": "ta.t14_solves_equations_related_to_s3_and_s4",
+    "t15": "ta.t15_interprets_and_forms_functions_related_to_s3_and_s4",
+    "t16": "ta.t16_understands_relations_between_geometric_concepts_related_to_s5",
+    "t17": "ta.t17_utilizes_properties_related_to_right_triangles_and_circles_related_to_s5",
+    "t18": "ta.t18_calculates_areas_and_volumes_related_to_s5",
+    "t19": "ta.t19_determines_statistical_measures_and_calculates_probabilities_related_to_s6",
+    "t20": "ta.t20_applies_algorithmic_thinking_and_problem_solving_including_through_programming_related_to_s1",
+}
+
+# Bit per area key, in key order; mirrored by the ca_mask/ta_mask columns
+# startup maintenance precomputes on items.
+CONTENT_AREA_BITS = {key: 1 << i for i, key in enumerate(CONTENT_AREA_MAP)}
+TARGET_AREA_BITS = {key: 1 << i for i, key in enumerate(TARGET_AREA_MAP)}
+
+# Numeric range filters as (>= clause, <= clause, join alias); the handler
+# zips these against the corresponding (min, max) arguments.
+RANGE_FILTERS = (
+    ("idl.meanp_all_classical >= ?", "idl.meanp_all_classical <= ?", "idl"),
+    ("ids.a_irt >= ?", "ids.a_irt <= ?", "ids"),
+    ("ids.meanrit_classical >= ?", "ids.meanrit_classical <= ?", "ids"),
+)
+
+# (sort column, ORDER BY template). The i.id tiebreaker is baked into every
+# non-unique sort so page order is stable and matches the cursor predicates;
+# {dir} is filled with ASC/DESC at assembly time.
 SAFE_SORT_COLUMNS = {
-    "id": "i.id",
-    "label": "i.label",
-    "name": "i.name",
-    "name_2": "i.name_2",
-    "source": "i.source",
-    "type": "it.item_type_all",
-    "level": "ih.hierarchical_level_all",
-    "meanp_all": "idl.meanp_all_classical",
-    "a_irt": "ids.a_irt",
-    "meanrit_classical": "ids.meanrit_classical",
-    "n": "i.n",
+    "id": ("i.id", "i.id {dir}"),
+    "label": ("i.label", "i.label {dir}, i.id {dir}"),
+    "name": ("i.name", "i.name {dir}, i.id {dir}"),
+    "name_2": ("i.name_2", "i.name_2 {dir}, i.id {dir}"),
+    "source": ("i.source", "i.source {dir}, i.id {dir}"),
+    "type": ("it.item_type_all", "it.item_type_all {dir}, i.id {dir}"),
+    "level": ("ih.hierarchical_level_all", "ih.hierarchical_level_all {dir}, i.id {dir}"),
+    "meanp_all": ("idl.meanp_all_classical", "idl.meanp_all_classical {dir}, i.id {dir}"),
+    "a_irt": ("ids.a_irt", "ids.a_irt {dir}, i.id {dir}"),
+    "meanrit_classical": ("ids.meanrit_classical", "ids.meanrit_classical {dir}, i.id {dir}"),
+    "n": ("i.n", "i.n {dir}, i.id {dir}"),
+}
+
+# Unfiltered totals per table; items.db only changes when ingest.py rebuilds
+# it offline, so a process-lifetime cache is safe.
+_row_count_cache: Dict[str, int] = {}
+
+# Index of each sortable column in the LIST_SELECT row, for reading the last
+# page row's sort value when building the next cursor. name_2 and n are
+# sortable but not projected, so those sorts page by offset only.
+_SORT_VALUE_INDEX = {
+    "i.id": 0, "i.label": 1, "i.name": 2, "i.source": 3,
+    "it.item_type_all": 4, "ih.hierarchical_level_all": 5,
+    "idl.meanp_all_classical": 6, "ids.meanrit_classical": 7, "ids.a_irt": 8,
 }
 
+
+
+# Filtered totals are amortized across pagination: every page of the same
+# filter combination reuses one count for COUNT_TTL seconds.
+COUNT_TTL = 60.0
+COUNT_CACHE_MAX = 1024
+_count_cache: Dict[Tuple[Any, ...], Tuple[float, int]] = {}
+
+# The filter option lists only change when the DB is rebuilt; cached together
+# with the payload's ETag so revalidations cost neither SQL nor encoding.
+FILTERS_TTL = 300.0
+_filters_cache: Optional[Tuple[float, Dict[str, Any], str]] = None
+
+
+def _cached_count(key: Tuple[Any, ...]) -> Optional[int]:
+    entry = _count_cache.get(key)
+    if entry is None:
+        return None
+    ts, total = entry
+    if time.monotonic() - ts > COUNT_TTL:
+        del _count_cache[key]
+        return None
+    return total
+
+
+def _store_count(key: Tuple[Any, ...], total: int) -> None:
+    if len(_count_cache) >= COUNT_CACHE_MAX:
+        _count_cache.clear()
+    _count_cache[key] = (time.monotonic(), total)
+
 # --- Query builders ---
 
-def build_base_select() -> str:
-    # Note: items_NuTa_content_area table has mixed case; must be quoted in SQL.
-    return (
+# Built once at import; the text never varies, so rebuilding it per request
+# only forced sqlite3 to re-key its statement cache.
+# Note: items_NuTa_content_area table has mixed case; must be quoted in SQL.
+BASE_SELECT = (
         "SELECT "
         " i.id, i.label, i.name, i.name_2, i.max, i.n, i.source, "
         " it.item_type_all, ih.hierarchical_level_all, "
@@ -127,7 +525,87 @@ def build_base_select() -> str:
         "LEFT JOIN items_content_area ic ON ic.id = i.id "
         "LEFT JOIN \"items_NuTa_content_area\" nt ON nt.id = i.id "
         "LEFT JOIN items_target_area ta ON ta.id = i.id "
-    )
+)
+
+GET_ITEM_SQL = BASE_SELECT + " WHERE i.id = ? LIMIT 1"
+
+# Response keys for each positional slice of a BASE_SELECT row, in SELECT
+# order; get_item zips these instead of ~50 named row lookups.
+DIFFICULTY_KEYS = (
+    "meanp_all_classical", "p_g3_classical", "p_g6_classical",
+    "p_g8_classical", "p_g9_classical",
+    "b_0_1_irt", "b01_2_irt", "b012_3_irt", "b0123_4_irt",
+    "se_b_0_1_irt", "se_b01_2_irt", "se_b012_3_irt", "se_b0123_4_irt",
+)
+DISCRIMINATION_KEYS = (
+    "meanrit_classical", "meang_classical", "meand_classical",
+    "meanstd_classical", "a_irt",
+)
+CONTENT_AREA_KEYS = ("S1", "S2", "S3", "S4", "S5", "S6")
+NUTA_KEYS = tuple(key for key, _ in NUTA_CONTENTS)
+TARGET_KEYS = tuple(f"t{i}" for i in range(10, 21))
+
+
+@lru_cache(maxsize=256)
+def _assemble_list_sql(where_clauses: Tuple[str, ...], order_template: str,
+                       sort_direction: str, keyset: bool,
+                       extra_aliases: Tuple[str, ...] = ()) -> str:
+    # extra_aliases: join tables referenced only by filters (nt, ta), which
+    # the projected columns never need. The template already carries the i.id
+    # tiebreaker, so offset and cursor pages share one total order.
+    joins = "".join(JOIN_SQL[a] for a in extra_aliases)
+    where_sql = f" WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
+    order_sql = " ORDER BY " + order_template.format(dir=sort_direction)
+    limit_offset = " LIMIT ?" if keyset else " LIMIT ? OFFSET ?"
+    return LIST_SELECT + joins + where_sql + order_sql + limit_offset
+
+
+# Joins by alias: every join is 1:1 on items.id, so both the narrowed list
+# query and the count can stitch in only the tables they actually touch.
+JOIN_SQL = {
+    "it": "LEFT JOIN items_type it ON it.id = i.id ",
+    "ih": "LEFT JOIN items_hierarchical_level ih ON ih.id = i.id ",
+    "idl": "LEFT JOIN items_difficulty_level idl ON idl.id = i.id ",
+    "ids": "LEFT JOIN items_discrimination ids ON ids.id = i.id ",
+    "ic": "LEFT JOIN items_content_area ic ON ic.id = i.id ",
+    "nt": "LEFT JOIN \"items_NuTa_content_area\" nt ON nt.id = i.id ",
+    "ta": "LEFT JOIN items_target_area ta ON ta.id = i.id ",
+}
+
+
+# The list endpoint returns ten fields plus s1..s6 for dominant_content_area;
+# the other ~35 columns of BASE_SELECT were decoded and discarded per row.
+LIST_BASE_ALIASES = ("it", "ih", "idl", "ids", "ic")
+LIST_SELECT = (
+    "SELECT "
+    " i.id, i.label, i.name, i.source, "
+    " it.item_type_all, ih.hierarchical_level_all, "
+    " idl.meanp_all_classical, ids.meanrit_classical, ids.a_irt, "
+    " ic.s1_thinking_skills_including_computational_thinking AS s1, "
+    " ic.s2_numbers_and_operations AS s2, ic.s3_algebra AS s3, ic.s4_functions AS s4, "
+    " ic.\"s5_geometry_and_measurement\" AS s5, ic.s6_data_handling_statistics_and_probability AS s6 "
+    "FROM items i " + "".join(JOIN_SQL[a] for a in LIST_BASE_ALIASES)
+)
+
+
+@lru_cache(maxsize=256)
+def _assemble_count_sql(where_clauses: Tuple[str, ...], aliases: Tuple[str, ...]) -> str:
+    joins = "".join(JOIN_SQL[a] for a in aliases)
+    where_sql = f" WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
+    return "SELECT COUNT(*) FROM items i " + joins + where_sql
+
+
+_RE_FTS_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def _fts_match_query(search: str) -> Optional[str]:
+    # MATCH has its own operator syntax (AND, OR, NEAR, quotes, columns), so
+    # raw user text cannot be passed through. Reduce it to quoted prefix
+    # terms; multiple terms AND together, matching the old LIKE intent.
+    tokens = _RE_FTS_TOKEN.findall(search)
+    if not tokens:
+        return None
+    return " ".join(f'"{t}"*' for t in tokens)
 
 
 def build_where_clauses(
@@ -144,129 +622,104 @@ def build_where_clauses(
     a_irt_max: Optional[float] = None,
     meanrit_min: Optional[float] = None,
     meanrit_max: Optional[float] = None,
-) -> Tuple[List[str], List[Any]]:
+) -> Tuple[List[str], List[Any], Set[str]]:
     clauses: List[str] = []
     params: List[Any] = []
-
-    # Map short keys to actual SQL columns to avoid relying on SELECT aliases in WHERE
-    content_area_map = {
-        "s1": "ic.s1_thinking_skills_including_computational_thinking",
-        "s2": "ic.s2_numbers_and_operations",
-        "s3": "ic.s3_algebra",
-        "s4": "ic.s4_functions",
-        "s5": "ic.\"s5_geometry_and_measurement\"",
-        "s6": "ic.s6_data_handling_statistics_and_probability",
-    }
-    target_area_map = {
-        "t10": "ta.t10_performs_mental_calculations_and_makes_inferences_related_to_s1_and_s2",
-        "t11": "ta.t11_performs_basic_calculations_with_rational_numbers_related_to_s2",
-        "t12": "ta.t12_understands_the_concept_of_a_real_number_related_to_s2",
-        "t13": "ta.t13_calculates_proportions_numbers_referring_to_percentages_and_percentages_related_to_change_and_comparison_related_to_s2",
-        "t14": "ta.t14_solves_equations_related_to_s3_and_s4",
-        "t15": "ta.t15_interprets_and_forms_functions_related_to_s3_and_s4",
-        "t16": "ta.t16_understands_relations_between_geometric_concepts_related_to_s5",
-        "t17": "ta.t17_utilizes_properties_related_to_right_triangles_and_circles_related_to_s5",
-        "t18": "ta.t18_calculates_areas_and_volumes_related_to_s5",
-        "t19": "ta.t19_determines_statistical_measures_and_calculates_probabilities_related_to_s6",
-        "t20": "ta.t20_applies_algorithmic_thinking_and_problem_solving_including_through_programming_related_to_s1",
-    }
+    # Table aliases the clauses reference, so the count query can skip
+    # joining tables no active filter touches.
+    aliases: Set[str] = set()
 
     if search:
-        like = f"%{search}%"
-        clauses.append(
-            "(i.label LIKE ? OR i.name LIKE ? OR i.source LIKE ? OR nt.contents LIKE ?)"
-        )
-        params.extend([like, like, like, like])
+        match = _fts_match_query(search) if _fts_available else None
+        if match:
+            # Subquery against the FTS index instead of four LIKE scans; no
+            # join alias needed since it resolves through i.id.
+            clauses.append("i.id IN (SELECT rowid FROM items_fts WHERE items_fts MATCH ?)")
+            params.append(match)
+        else:
+            like = f"%{search}%"
+            clauses.append(
+                "(i.label LIKE ? OR i.name LIKE ? OR i.source LIKE ? OR nt.contents LIKE ?)"
+            )
+            params.extend([like, like, like, like])
+            aliases.add("nt")
 
     if item_types:
-        placeholders = ",".join(["?"] * len(item_types))
-        clauses.append(f"it.item_type_all IN ({placeholders})")
+        clauses.append(_in_clause("it.item_type_all", len(item_types)))
         params.extend(item_types)
+        aliases.add("it")
 
     if levels:
-        placeholders = ",".join(["?"] * len(levels))
-        clauses.append(f"ih.hierarchical_level_all IN ({placeholders})")
+        clauses.append(_in_clause("ih.hierarchical_level_all", len(levels)))
         params.extend(levels)
+        aliases.add("ih")
 
     if content_areas:
+        mask = 0
         cols = []
         for ca in content_areas:
             key = (ca or "").lower().strip()
-            if key not in content_area_map:
+            if key not in CONTENT_AREA_MAP:
                 raise HTTPException(status_code=400, detail="Invalid content_area; use s1..s6")
-            cols.append(content_area_map[key])
-        if cols:
-            or_clause = " OR ".join([f"COALESCE({c}, 0) > 0" for c in cols])
-            clauses.append(f"({or_clause})")
+            mask |= CONTENT_AREA_BITS[key]
+            cols.append(CONTENT_AREA_MAP[key])
+        if _mask_filters_available:
+            # One integer AND on items itself; no ic join and no COALESCEs.
+            clauses.append("(i.ca_mask & ?) <> 0")
+            params.append(mask)
+        elif cols:
+            clauses.append(_coalesce_or(tuple(cols)))
+            aliases.add("ic")
 
     if target_areas:
+        mask = 0
         cols = []
         for t in target_areas:
             tkey = (t or "").lower().strip()
-            if tkey not in target_area_map:
+            if tkey not in TARGET_AREA_MAP:
                 raise HTTPException(status_code=400, detail="Invalid target area key")
-            cols.append(target_area_map[tkey])
-        if cols:
-            or_clause = " OR ".join([f"COALESCE({c}, 0) > 0" for c in cols])
-            clauses.append(f"({or_clause})")
+            mask |= TARGET_AREA_BITS[tkey]
+            cols.append(TARGET_AREA_MAP[tkey])
+        if _mask_filters_available:
+            clauses.append("(i.ta_mask & ?) <> 0")
+            params.append(mask)
+        elif cols:
+            clauses.append(_coalesce_or(tuple(cols)))
+            aliases.add("ta")
 
     if nuta_levels:
-        placeholders = ",".join(["?"] * len(nuta_levels))
-        clauses.append(f"nt.nuta_skill_level IN ({placeholders})")
+        clauses.append(_in_clause("nt.nuta_skill_level", len(nuta_levels)))
         params.extend(nuta_levels)
+        aliases.add("nt")
 
     if sources:
-        placeholders = ",".join(["?"] * len(sources))
-        clauses.append(f"i.source IN ({placeholders})")
+        clauses.append(_in_clause("i.source", len(sources)))
         params.extend(sources)
 
-    if meanp_min is not None:
-        clauses.append("idl.meanp_all_classical >= ?")
-        params.append(meanp_min)
-    if meanp_max is not None:
-        clauses.append("idl.meanp_all_classical <= ?")
-        params.append(meanp_max)
-
-    if a_irt_min is not None:
-        clauses.append("ids.a_irt >= ?")
-        params.append(a_irt_min)
-    if a_irt_max is not None:
-        clauses.append("ids.a_irt <= ?")
-        params.append(a_irt_max)
-
-    if meanrit_min is not None:
-        clauses.append("ids.meanrit_classical >= ?")
-        params.append(meanrit_min)
-    if meanrit_max is not None:
-        clauses.append("ids.meanrit_classical <= ?")
-        params.append(meanrit_max)
-
-    return clauses, params
-
-
-def dominant_content_area(row: sqlite3.Row) -> Optional[str]:
-    # Determine dominant content area label by max value among s1..s6
-    values = [(row["s1"], CONTENT_AREAS[0][1]), (row["s2"], CONTENT_AREAS[1][1]), (row["s3"], CONTENT_AREAS[2][1]),
-              (row["s4"], CONTENT_AREAS[3][1]), (row["s5"], CONTENT_AREAS[4][1]), (row["s6"], CONTENT_AREAS[5][1])]
-    max_val = None
-    max_label = None
-    for v, label in values:
-        try:
-            fv = float(v) if v is not None else 0.0
-        except Exception:
-            fv = 0.0
-        if max_val is None or fv > max_val:
-            max_val = fv
-            max_label = label
-    if max_val is None or max_val <= 0:
-        return None
-    return max_label
+    ranges = ((meanp_min, meanp_max), (a_irt_min, a_irt_max), (meanrit_min, meanrit_max))
+    for (ge_clause, le_clause, alias), (lo, hi) in zip(RANGE_FILTERS, ranges):
+        if lo is not None:
+            clauses.append(ge_clause)
+            params.append(lo)
+            aliases.add(alias)
+        if hi is not None:
+            clauses.append(le_clause)
+            params.append(hi)
+            aliases.add(alias)
+
+    return clauses, params, aliases
+
+
+CONTENT_AREA_LABELS = tuple(label for _, label in CONTENT_AREAS)
 
 
 @app.get("/api/items")
-def list_items(
+async def list_items(
+    request: Request,
     page: int = Query(1, ge=1),
     page_size: int = Query(25, ge=1, le=100),
+    after_id: Optional[int] = Query(None, ge=0),
+    cursor: Optional[str] = Query(None),
     search: Optional[str] = None,
     item_type: Optional[List[str]] = Query(None),
     level: Optional[List[str]] = Query(None),
@@ -282,9 +735,29 @@ def list_items(
     meanrit_max: Optional[float] = None,
     sort_by: str = Query("id"),
     sort_dir: str = Query("asc"),
+    fields: Optional[str] = Query(None),
 ):
-    base = build_base_select()
-    where_clauses, params = build_where_clauses(
+    # A page is fully determined by the query string and the DB file, so a
+    # weak ETag lets polling clients revalidate without any SQL or encoding.
+    try:
+        mtime_ns = os.stat(DB_PATH).st_mtime_ns
+    except OSError:
+        mtime_ns = 0
+    etag_src = f"{sorted(request.query_params.multi_items())}|{mtime_ns}"
+    etag = 'W/"' + hashlib.blake2b(etag_src.encode(), digest_size=8).hexdigest() + '"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    # Optional projection: comma-separated subset of LIST_ITEM_FIELDS.
+    chosen: Optional[List[str]] = None
+    if fields:
+        requested = {f.strip() for f in fields.split(",") if f.strip()}
+        unknown = requested - LIST_ITEM_FIELD_SET
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown field(s): {', '.join(sorted(unknown))}")
+        chosen = [f for f in LIST_ITEM_FIELDS if f in requested]
+
+    where_clauses, params, filter_aliases = build_where_clauses(
         search=search,
         item_types=item_type,
         levels=level,
@@ -300,126 +773,170 @@ def list_items(
         meanrit_max=meanrit_max,
     )
 
-    where_sql = f" WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
-
-    sort_col = SAFE_SORT_COLUMNS.get(sort_by, "i.id")
+    sort_col, order_template = SAFE_SORT_COLUMNS.get(sort_by, SAFE_SORT_COLUMNS["id"])
     sort_direction = "DESC" if str(sort_dir).lower() == "desc" else "ASC"
 
-    limit_offset = " LIMIT ? OFFSET ?"
-    params_with_paging = list(params) + [page_size, (page - 1) * page_size]
-
-    sql = base + where_sql + f" ORDER BY {sort_col} {sort_direction}" + limit_offset
-    # Count distinct item IDs to avoid duplicates from LEFT JOINs
-    count_sql = "SELECT COUNT(DISTINCT t.id) as cnt FROM (" + base + where_sql + ") AS t"
-
-    with get_conn() as conn:
-        cur = conn.cursor()
-        rows = cur.execute(sql, params_with_paging).fetchall()
-        total = cur.execute(count_sql, params).fetchone()[0]
+    # Keyset fast path: seek past the last seen (sort value, id) instead of
+    # making SQLite walk and discard OFFSET rows. Offset mode stays the
+    # default when no cursor is given, so existing clients are unaffected.
+    count_clauses, count_params = where_clauses, params
+    keyset = False
+    if cursor is not None:
+        # The seek clause only narrows the page fetch; the total still
+        # reflects the full filtered set.
+        keyset = True
+        decoded = _decode_cursor(cursor)
+        if decoded is None:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        sort_value, cursor_id = decoded
+        op = ">" if sort_direction == "ASC" else "<"
+        if sort_col == "i.id":
+            where_clauses = where_clauses + [f"i.id {op} ?"]
+            params = params + [cursor_id]
+        elif sort_value is None:
+            # Cursor inside the NULL run. ASC sorts NULLs first, so what
+            # remains is the rest of the run then every non-NULL row; DESC
+            # sorts them last, so only earlier ids of the run remain.
+            if sort_direction == "ASC":
+                where_clauses = where_clauses + [f"({sort_col} IS NOT NULL OR i.id > ?)"]
+            else:
+                where_clauses = where_clauses + [f"({sort_col} IS NULL AND i.id < ?)"]
+            params = params + [cursor_id]
+        elif sort_direction == "ASC":
+            # NULLs already sorted before any non-NULL value, so the plain
+            # row-value seek (which drops NULL comparisons) is exact.
+            where_clauses = where_clauses + [f"({sort_col}, i.id) > (?, ?)"]
+            params = params + [sort_value, cursor_id]
+        else:
+            # DESC still has the NULL run ahead; keep it in the result set.
+            where_clauses = where_clauses + [f"({sort_col} IS NULL OR ({sort_col}, i.id) < (?, ?))"]
+            params = params + [sort_value, cursor_id]
+    elif after_id is not None and sort_col == "i.id" and sort_direction == "ASC":
+        keyset = True
+        where_clauses = where_clauses + ["i.id > ?"]
+        params = params + [after_id]
+
+    if keyset:
+        params_with_paging = list(params) + [page_size]
+    else:
+        params_with_paging = list(params) + [page_size, (page - 1) * page_size]
+
+    # Clause fragments come from fixed whitelists, so the assembled SQL for a
+    # given filter/sort combination is memoized and reused across requests.
+    extra_aliases = tuple(sorted(filter_aliases - set(LIST_BASE_ALIASES)))
+    sql = _assemble_list_sql(tuple(where_clauses), order_template, sort_direction, keyset, extra_aliases)
+    count_sql = _assemble_count_sql(tuple(count_clauses), tuple(sorted(filter_aliases)))
 
     items = []
-    for r in rows:
-        items.append({
-            "id": r["id"],
-            "label": r["label"],
-            "name": r["name"],
-            "source": r["source"],
-            "item_type_all": r["item_type_all"],
-            "hierarchical_level_all": r["hierarchical_level_all"],
-            "meanp_all_classical": r["meanp_all_classical"],
-            "meanrit_classical": r["meanrit_classical"],
-            "a_irt": r["a_irt"],
-            "dominant_content_area": dominant_content_area(r),
-        })
-
-    return {
+    last_vals = None
+    async with get_conn() as conn:
+        cur = await conn.execute(sql, params_with_paging)
+        async for r in cur:
+            vals = tuple(r)
+            last_vals = vals
+            item = _make_list_item(vals, LIST_ROW_KEYS, CONTENT_AREA_LABELS)
+            items.append({k: item[k] for k in chosen} if chosen else item)
+        if count_clauses:
+            count_key = (tuple(count_clauses), tuple(count_params))
+            total = _cached_count(count_key)
+            if total is None:
+                cur = await conn.execute(count_sql, count_params)
+                total = (await cur.fetchone())[0]
+                _store_count(count_key, total)
+        else:
+            # No filters: COUNT over the whole join is the expensive half of
+            # the request, so reuse the cached table total.
+            total = _row_count_cache.get("items")
+            if total is None:
+                cur = await conn.execute(count_sql)
+                total = (await cur.fetchone())[0]
+                _row_count_cache["items"] = total
+
+    # Hand out the next seek position whenever the page was full and the sort
+    # column is projected (name_2/n sorts stay on offset mode). A NULL sort
+    # value is a valid position: the seek clauses handle the NULL run on both
+    # ends of the order.
+    next_cursor = None
+    if last_vals is not None and len(items) == page_size:
+        sort_idx = _SORT_VALUE_INDEX.get(sort_col)
+        if sort_idx is not None:
+            next_cursor = _encode_cursor(last_vals[sort_idx], last_vals[0])
+
+    return ORJSONResponse({
         "page": page,
         "page_size": page_size,
         "total": total,
         "total_pages": (total + page_size - 1) // page_size,
+        "next_after_id": last_vals[0] if keyset and len(items) == page_size else None,
+        "next_cursor": next_cursor,
         "items": items,
-    }
+    }, headers={"ETag": etag, "Cache-Control": "public, max-age=60"})
 
 
 @app.get("/api/items/{item_id}")
-def get_item(item_id: int):
-    base = build_base_select()
-    sql = base + " WHERE i.id = ? LIMIT 1"
-    with get_conn() as conn:
-        row = conn.execute(sql, (item_id,)).fetchone()
+async def get_item(item_id: int):
+    async with get_conn() as conn:
+        cur = await conn.execute(GET_ITEM_SQL, (item_id,))
+        row = await cur.fetchone()
     if row is None:
         raise HTTPException(status_code=404, detail="Item not found")
 
-    # Build detailed response
-    content_areas = {
-        "S1": float(row["s1"]) if row["s1"] is not None else 0,
-        "S2": float(row["s2"]) if row["s2"] is not None else 0,
-        "S3": float(row["s3"]) if row["s3"] is not None else 0,
-        "S4": float(row["s4"]) if row["s4"] is not None else 0,
-        "S5": float(row["s5"]) if row["s5"] is not None else 0,
-        "S6": float(row["s6"]) if row["s6"] is not None else 0,
-    }
-
-    nuta_contents = { key: float(row[key]) if row[key] is not None else 0 for key, _ in NUTA_CONTENTS }
-    targets = { f"t{i}": float(row[f"t{i}"]) if row[f"t{i}"] is not None else 0 for i in range(10, 21) }
-
+    # Positional slices of the BASE_SELECT row zipped against static key
+    # tuples; `v or 0.0` folds both NULL and 0 to 0.0 like the old
+    # float-or-zero pattern, without a Python branch per column.
+    vals = tuple(row)
     return {
-        "id": row["id"],
-        "label": row["label"],
-        "name": row["name"],
-        "name_2": row["name_2"],
-        "max": row["max"],
-        "n": row["n"],
-        "source": row["source"],
-        "type": row["item_type_all"],
-        "hierarchical_level": row["hierarchical_level_all"],
-        "difficulty": {
-            "meanp_all_classical": row["meanp_all_classical"],
-            "p_g3_classical": row["p_g3_classical"],
-            "p_g6_classical": row["p_g6_classical"],
-            "p_g8_classical": row["p_g8_classical"],
-            "p_g9_classical": row["p_g9_classical"],
-            "b_0_1_irt": row["b_0_1_irt"],
-            "b01_2_irt": row["b01_2_irt"],
-            "b012_3_irt": row["b012_3_irt"],
-            "b0123_4_irt": row["b0123_4_irt"],
-            "se_b_0_1_irt": row["se_b_0_1_irt"],
-            "se_b01_2_irt": row["se_b01_2_irt"],
-            "se_b012_3_irt": row["se_b012_3_irt"],
-            "se_b0123_4_irt": row["se_b0123_4_irt"],
-        },
-        "discrimination": {
-            "meanrit_classical": row["meanrit_classical"],
-            "meang_classical": row["meang_classical"],
-            "meand_classical": row["meand_classical"],
-            "meanstd_classical": row["meanstd_classical"],
-            "a_irt": row["a_irt"],
-        },
-        "content_area": content_areas,
+        "id": vals[0],
+        "label": vals[1],
+        "name": vals[2],
+        "name_2": vals[3],
+        "max": vals[4],
+        "n": vals[5],
+        "source": vals[6],
+        "type": vals[7],
+        "hierarchical_level": vals[8],
+        "difficulty": dict(zip(DIFFICULTY_KEYS, vals[9:22])),
+        "discrimination": dict(zip(DISCRIMINATION_KEYS, vals[22:27])),
+        "content_area": dict(zip(CONTENT_AREA_KEYS, (v or 0.0 for v in vals[27:33]))),
         "nuta": {
-            "nuta_skill_level": row["nuta_skill_level"],
-            "contents": row["nuta_contents"],
-            "weights": nuta_contents,
+            "nuta_skill_level": vals[33],
+            "contents": vals[34],
+            "weights": dict(zip(NUTA_KEYS, (v or 0.0 for v in vals[35:44]))),
         },
-        "targets": targets,
-        "dominant_content_area": dominant_content_area(row),
+        "targets": dict(zip(TARGET_KEYS, (v or 0.0 for v in vals[44:55]))),
+        "dominant_content_area": _dominant_from_vals(vals[27:33], CONTENT_AREA_LABELS),
     }
 
 
-@app.get("/api/filters")
-def get_filters():
-    with get_conn() as conn:
-        cur = conn.cursor()
-        item_types = [r[0] for r in cur.execute("SELECT DISTINCT item_type_all FROM items_type WHERE item_type_all IS NOT NULL ORDER BY 1").fetchall()]
-        levels = [r[0] for r in cur.execute("SELECT DISTINCT hierarchical_level_all FROM items_hierarchical_level WHERE hierarchical_level_all IS NOT NULL ORDER BY 1").fetchall()]
-        nuta_levels = [r[0] for r in cur.execute("SELECT DISTINCT nuta_skill_level FROM \"items_NuTa_content_area\" WHERE nuta_skill_level IS NOT NULL ORDER BY 1").fetchall()]
-        sources = [r[0] for r in cur.execute("SELECT DISTINCT source FROM items WHERE source IS NOT NULL ORDER BY 1").fetchall()]
+# One round-trip for all four distinct-value lists; UNION dedupes per branch.
+FILTER_VALUES_SQL = (
+    "SELECT 'item_type' AS kind, item_type_all AS value FROM items_type WHERE item_type_all IS NOT NULL "
+    "UNION SELECT 'level', hierarchical_level_all FROM items_hierarchical_level WHERE hierarchical_level_all IS NOT NULL "
+    "UNION SELECT 'nuta_level', nuta_skill_level FROM \"items_NuTa_content_area\" WHERE nuta_skill_level IS NOT NULL "
+    "UNION SELECT 'source', source FROM items WHERE source IS NOT NULL "
+    "ORDER BY 1, 2"
+)
 
-    return {
-        "item_types": item_types,
-        "hierarchical_levels": levels,
-        "nuta_skill_levels": nuta_levels,
-        "sources": sources,
+
+@app.get("/api/filters")
+async def get_filters(request: Request):
+    global _filters_cache
+    if _filters_cache is not None and time.monotonic() - _filters_cache[0] <= FILTERS_TTL:
+        payload, etag = _filters_cache[1], _filters_cache[2]
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        return ORJSONResponse(payload, headers={"ETag": etag, "Cache-Control": "public, max-age=60"})
+
+    buckets: Dict[str, List[Any]] = {"item_type": [], "level": [], "nuta_level": [], "source": []}
+    async with get_conn() as conn:
+        for kind, value in await conn.execute_fetchall(FILTER_VALUES_SQL):
+            buckets[kind].append(value)
+
+    payload = {
+        "item_types": buckets["item_type"],
+        "hierarchical_levels": buckets["level"],
+        "nuta_skill_levels": buckets["nuta_level"],
+        "sources": buckets["source"],
         "content_areas": [
             {"key": "s1", "label": CONTENT_AREAS[0][1]},
             {"key": "s2", "label": CONTENT_AREAS[1][1]},
@@ -432,6 +949,21 @@ def get_filters():
             {"key": key, "label": label} for key, label in TARGET_AREAS
         ],
     }
+    etag = '"' + hashlib.blake2b(orjson.dumps(payload), digest_size=8).hexdigest() + '"'
+    _filters_cache = (time.monotonic(), payload, etag)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return ORJSONResponse(payload, headers={"ETag": etag, "Cache-Control": "public, max-age=60"})
+
+
+@app.post("/api/cache/flush")
+def flush_caches():
+    # Manual invalidation hook for after an out-of-band DB rebuild.
+    global _filters_cache
+    _filters_cache = None
+    _count_cache.clear()
+    _row_count_cache.clear()
+    return {"status": "flushed"}
 
 
 # Serve static files (frontend)
@@ -459,9 +991,9 @@ def favicon():
 
 # Optional: health check
 @app.get("/api/health")
-def health():
+async def health():
     try:
-        with get_conn() as _:
+        async with get_conn() as _:
             pass
         return {"status": "ok"}
     except Exception as e: